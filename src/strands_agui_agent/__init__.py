@@ -13,11 +13,30 @@ Features:
 - Single clean server implementation
 """
 
-from .agent import StrandsAGUIAgent
-from .server import create_app
+from importlib import import_module
 
 __version__ = "0.2.0"
 __all__ = [
     "StrandsAGUIAgent",
     "create_app"
-]
\ No newline at end of file
+]
+
+# Public names resolved lazily so importing the package (e.g. from the CLI)
+# doesn't drag in strands/FastAPI until one of them is actually used.
+_LAZY_EXPORTS = {
+    "StrandsAGUIAgent": ".agent",
+    "create_app": ".server",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -6,60 +6,375 @@ with the AG-UI protocol, using native Strands tool execution and event streaming
 """
 
 import asyncio
+import inspect
+import itertools
 import json
 import logging
-import uuid
-from typing import Any, AsyncGenerator, Dict, List, Optional, Union
-from dataclasses import dataclass
-
-from strands import Agent, tool
-from strands.models.bedrock import BedrockModel
-from strands.types._events import TypedEvent, ModelStreamChunkEvent, ToolStreamEvent, ToolResultEvent
-from strands.types.content import ContentBlock
-from strands.types.tools import ToolResult
+import os
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
 
 from ag_ui.core import (
+    AssistantMessage,
     Event,
+    EventType,
     Message,
     RunAgentInput,
-    TextMessageStartEvent,
+    RunErrorEvent,
+    RunFinishedEvent,
+    RunStartedEvent,
+    SystemMessage,
     TextMessageContentEvent,
     TextMessageEndEvent,
-    ToolCallStartEvent,
+    TextMessageStartEvent,
     ToolCallArgsEvent,
     ToolCallEndEvent,
-    ToolCallResultEvent,
-    RunStartedEvent,
-    RunFinishedEvent,
-    RunErrorEvent,
-    UserMessage,
-    AssistantMessage,
+    ToolCallStartEvent,
     ToolMessage,
-    SystemMessage,
-    ToolCall,
-    FunctionCall,
+    UserMessage,
 )
+from strands import Agent, tool
+from strands.types._events import TypedEvent
 
 from .config import config
+from .sse import encode_sse
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)  # Ensure DEBUG level is enabled
 
-@dataclass
+# These ids go out on the wire as messageId/toolCallId and come back in
+# persisted histories, so a counter alone is not enough: PIDs recycle and
+# the counter restarts after a redeploy. A random prefix drawn once at
+# import keeps ids unique across restarts while still avoiding the
+# os.urandom syscall and formatting cost of uuid4 per id.
+_ID_PREFIX = f"m-{os.getpid()}-{os.urandom(4).hex()}"
+_ID_COUNTER = itertools.count(1)
+
+
+def _new_id() -> str:
+    """Return a correlation id unique across processes and restarts."""
+    return f"{_ID_PREFIX}-{next(_ID_COUNTER)}"
+
+
+@lru_cache(maxsize=4096)
+def _parse_args(arguments: str) -> dict[str, Any]:
+    """Parse tool-call argument JSON, memoized on the raw string.
+
+    Histories are re-converted on every run, so the same argument strings
+    come through repeatedly for the life of a conversation.
+    """
+    return _loads(arguments)
+
+# Model settings resolved once at import time; changing the agent config at
+# runtime requires re-importing this module.
+_MODEL_ID = config.agent.model_id
+_TEMPERATURE = config.agent.temperature
+_STREAMING = config.agent.streaming
+
+# Maximum number of tool-specific agents kept alive for reuse.
+_AGENT_CACHE_SIZE = 16
+
+# Upper bound on tracked execution states; oldest entries are evicted so a
+# long-running server cannot leak state for runs that never get cleaned up.
+_EXECUTION_STATE_LIMIT = 4096
+
+# How long _drive lets a buffered text delta age (measured from when it was
+# first buffered) before flushing it downstream.
+_DELTA_FLUSH_DELAY = 0.005
+
+# Flush a buffered delta once it reaches this many characters regardless of
+# timing, mirroring the byte cap in the server's _coalesce, so a fast stream
+# can never buffer a whole completion into one event.
+_DELTA_FLUSH_SIZE = 4096
+
+
+def _default_model():
+    """Build the configured Bedrock model.
+
+    BedrockModel is imported here rather than at module scope because it
+    drags in boto3/botocore, which dominates cold-start time; callers that
+    supply their own agent never pay for it.
+    """
+    from strands.models.bedrock import BedrockModel
+
+    return BedrockModel(
+        model_id=_MODEL_ID,
+        temperature=_TEMPERATURE,
+        streaming=_STREAMING,
+    )
+
+
+def _conv_user(message: UserMessage) -> dict[str, Any]:
+    return {"role": "user", "content": [{"text": message.content}]}
+
+
+def _conv_assistant(message: AssistantMessage) -> dict[str, Any]:
+    tool_calls = message.tool_calls
+    if not tool_calls and message.content:
+        # Plain text replies are the overwhelmingly common case; skip the
+        # incremental content-list build entirely.
+        return {"role": "assistant", "content": [{"text": message.content}]}
+    content = []
+    if message.content:
+        content.append({"text": message.content})
+    if tool_calls:
+        content.extend({
+            "toolUse": {
+                "toolUseId": tc.id,
+                "name": tc.function.name,
+                "input": _parse_args(tc.function.arguments)
+                if isinstance(tc.function.arguments, str)
+                else tc.function.arguments
+            }
+        } for tc in tool_calls)
+    return {"role": "assistant", "content": content}
+
+
+def _conv_system(message: SystemMessage) -> dict[str, Any]:
+    return {"role": "system", "content": [{"text": message.content}]}
+
+
+def _conv_tool(message: ToolMessage) -> dict[str, Any]:
+    return {
+        "role": "user",
+        "content": [{
+            "toolResult": {
+                "toolUseId": message.tool_call_id,
+                "content": [{"text": message.content}],
+                "status": "error" if getattr(message, 'error', None) else "success"
+            }
+        }]
+    }
+
+
+def _conv_default(message: Message) -> dict[str, Any]:
+    return {"role": message.role, "content": [{"text": message.content or ""}]}
+
+
+# Role-keyed dispatch: Message is a discriminated union on role, so the
+# role string identifies the concrete class without any type lookups.
+_ROLE_DISPATCH = {
+    "user": _conv_user,
+    "assistant": _conv_assistant,
+    "system": _conv_system,
+    "tool": _conv_tool,
+}
+
+
+def _mk_text_start(message_id: str) -> TextMessageStartEvent:
+    """Build a TextMessageStartEvent without re-running pydantic validation."""
+    return TextMessageStartEvent.model_construct(
+        type=EventType.TEXT_MESSAGE_START,
+        message_id=message_id,
+        role="assistant"
+    )
+
+
+def _mk_text_end(message_id: str) -> TextMessageEndEvent:
+    """Build a TextMessageEndEvent without re-running pydantic validation."""
+    return TextMessageEndEvent.model_construct(
+        type=EventType.TEXT_MESSAGE_END,
+        message_id=message_id
+    )
+
+
+def _mk_tool_end(tool_call_id: str) -> ToolCallEndEvent:
+    """Build a ToolCallEndEvent without re-running pydantic validation."""
+    return ToolCallEndEvent.model_construct(
+        type=EventType.TOOL_CALL_END,
+        tool_call_id=tool_call_id
+    )
+
+
+@dataclass(slots=True)
 class ExecutionState:
     """State management for tool execution flow."""
     thread_id: str
     run_id: str
-    pending_tools: Dict[str, Dict[str, Any]]
-    tool_results: Dict[str, str]
-    current_message_id: Optional[str] = None
+    pending_tools: dict[str, dict[str, Any]] = field(default_factory=dict)
+    tool_results: dict[str, str] = field(default_factory=dict)
+    current_message_id: str | None = None
     waiting_for_tools: bool = False
+    message_started: bool = False
 
-    def __post_init__(self):
-        if not hasattr(self, 'pending_tools'):
-            self.pending_tools = {}
-        if not hasattr(self, 'tool_results'):
-            self.tool_results = {}
+
+def _close_text(state: ExecutionState) -> Iterator[Event]:
+    """Close the open text message, if any.
+
+    Tool events must not appear between TEXT_MESSAGE_START and
+    TEXT_MESSAGE_END, so tool handlers call this first; a fresh message id
+    is assigned for any text that follows the tool events.
+    """
+    if state.message_started:
+        yield _mk_text_end(state.current_message_id)
+        state.message_started = False
+        state.current_message_id = _new_id()
+
+
+def _h_content_block_delta(
+    event_data: dict[str, Any],
+    state: ExecutionState,
+    # Pre-bound defaults turn per-chunk LOAD_GLOBAL/LOAD_ATTR into LOAD_FAST.
+    _mk_content=TextMessageContentEvent.model_construct,
+    _content_type=EventType.TEXT_MESSAGE_CONTENT,
+) -> Iterator[Event]:
+    # Single nested subscript instead of chained membership tests: the text
+    # key is present on virtually every delta, so the KeyError path is rare.
+    try:
+        text = event_data['contentBlockDelta']['delta']['text']
+    except KeyError:
+        return
+    if not state.message_started:
+        # The message id was assigned up front in run_streaming; the start
+        # event is only emitted once text actually arrives, so tool-only
+        # runs never open an empty text message.
+        state.message_started = True
+        yield _mk_text_start(state.current_message_id)
+    yield _mk_content(
+        type=_content_type,
+        message_id=state.current_message_id,
+        delta=text
+    )
+
+
+def _h_content_block_start(event_data: dict[str, Any], state: ExecutionState) -> Iterator[Event]:
+    try:
+        tool_use = event_data['contentBlockStart']['start']['toolUse']
+    except KeyError:
+        return
+    yield from _close_text(state)
+    tool_call_id = tool_use.get('toolUseId') or _new_id()
+    tool_name = tool_use.get('name', 'unknown')
+
+    state.pending_tools[tool_call_id] = {
+        'name': tool_name,
+        'input': tool_use.get('input', {})
+    }
+
+    yield ToolCallStartEvent.model_construct(
+        type=EventType.TOOL_CALL_START,
+        tool_call_id=tool_call_id,
+        tool_call_name=tool_name
+    )
+
+
+# Handlers for the model-stream events nested under the 'event' key. There is
+# no messageStart handler: the message id is assigned up front in
+# run_streaming and the start event is emitted on the first text delta.
+_MODEL_EVENT_HANDLERS = {
+    'contentBlockDelta': _h_content_block_delta,
+    'contentBlockStart': _h_content_block_start,
+}
+
+_KNOWN_MODEL_EVENTS = frozenset(_MODEL_EVENT_HANDLERS)
+
+
+def _h_model_event(
+    strands_event: dict[str, Any],
+    state: ExecutionState,
+    _known=_KNOWN_MODEL_EVENTS,
+    _handlers=_MODEL_EVENT_HANDLERS,
+) -> Iterator[Event]:
+    event_data = strands_event['event']
+    # Model-stream events carry a single kind key, so one C-level set
+    # intersection replaces per-kind membership probes.
+    hit = _known.intersection(event_data)
+    if hit:
+        yield from _handlers[next(iter(hit))](event_data, state)
+
+
+def _h_current_tool_use(strands_event: dict[str, Any], state: ExecutionState) -> Iterator[Event]:
+    """Handle current_tool_use events (tool input streaming)."""
+    tool_use = strands_event['current_tool_use']
+    tool_call_id = tool_use.get('toolUseId') or _new_id()
+
+    # Check if this is a new tool or continuation
+    if tool_call_id not in state.pending_tools:
+        yield from _close_text(state)
+        tool_input = tool_use.get('input', {})
+        args_json = _dumps(tool_input) if tool_input else '{}'
+        state.pending_tools[tool_call_id] = {
+            'name': tool_use.get('name', 'unknown'),
+            'input': tool_input,
+            'args_json': args_json
+        }
+
+        yield ToolCallStartEvent.model_construct(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id=tool_call_id,
+            tool_call_name=tool_use.get('name', 'unknown')
+        )
+
+        # Emit args event only once when tool starts, with complete input
+        yield ToolCallArgsEvent.model_construct(
+            type=EventType.TOOL_CALL_ARGS,
+            tool_call_id=tool_call_id,
+            delta=args_json
+        )
+    else:
+        # Update the input for existing tool, but don't emit args again
+        pending = state.pending_tools[tool_call_id]
+        pending['input'] = tool_use.get('input', {})
+        pending.pop('args_json', None)  # stale once the input changes
+
+
+def _h_message_complete(strands_event: dict[str, Any], state: ExecutionState) -> Iterator[Event]:
+    """Handle a complete assistant message carrying toolUse blocks."""
+    message = strands_event['message']
+    if message.get('role') == 'assistant' and 'content' in message:
+        for content_item in message['content']:
+            if 'toolUse' in content_item:
+                yield from _close_text(state)
+                tool_use = content_item['toolUse']
+                tool_call_id = tool_use.get('toolUseId') or _new_id()
+                tool_name = tool_use.get('name', 'unknown')
+                tool_input = tool_use.get('input', {})
+
+                # Ensure we have the tool tracked, reusing the serialized
+                # args from the streaming phase when the input is unchanged.
+                pending = state.pending_tools.get(tool_call_id)
+                if pending is None:
+                    pending = {'name': tool_name, 'input': tool_input}
+                    state.pending_tools[tool_call_id] = pending
+
+                args_json = pending.get('args_json')
+                if args_json is None or pending['input'] != tool_input:
+                    args_json = _dumps(tool_input) if tool_input else '{}'
+                    pending['input'] = tool_input
+                    pending['args_json'] = args_json
+
+                # Emit tool args event with complete input
+                yield ToolCallArgsEvent.model_construct(
+                    type=EventType.TOOL_CALL_ARGS,
+                    tool_call_id=tool_call_id,
+                    delta=args_json
+                )
+
+                # Emit tool call end
+                yield _mk_tool_end(tool_call_id)
+
+
+# Checked in order: the first key present in the Strands event wins, matching
+# the priority of the original if/elif chain.
+_STRANDS_DISPATCH = {
+    'event': _h_model_event,
+    'current_tool_use': _h_current_tool_use,
+    'message': _h_message_complete,
+}
 
 
 class StrandsAGUIAgent:
@@ -72,8 +387,8 @@ class StrandsAGUIAgent:
 
     def __init__(
         self,
-        strands_agent: Optional[Agent] = None,
-        agent_name: Optional[str] = None,
+        strands_agent: Agent | None = None,
+        agent_name: str | None = None,
         **kwargs
     ):
         """
@@ -85,231 +400,202 @@ class StrandsAGUIAgent:
             **kwargs: Additional configuration options
         """
         self.agent_name = agent_name or config.agent.name
-        self.execution_states: Dict[str, ExecutionState] = {}
+        self.execution_states: OrderedDict[tuple[str, str], ExecutionState] = OrderedDict()
+        self._agent_cache: OrderedDict[int, Agent] = OrderedDict()
 
         if strands_agent is None:
-            model = BedrockModel(
-                model_id=config.agent.model_id,
-                temperature=config.agent.temperature,
-                streaming=config.agent.streaming,
-            )
-            self.strands_agent = Agent(model=model, **kwargs)
+            self.strands_agent = Agent(model=_default_model(), **kwargs)
         else:
             self.strands_agent = strands_agent
 
-    def _convert_agui_message_to_strands(self, message: Message) -> Dict[str, Any]:
+    def _convert_agui_message_to_strands(self, message: Message) -> dict[str, Any]:
         """Convert AG-UI message to Strands message format."""
-        if isinstance(message, UserMessage):
-            return {"role": "user", "content": [{"text": message.content}]}
-        elif isinstance(message, AssistantMessage):
-            content = []
-            if message.content:
-                content.append({"text": message.content})
-            if message.tool_calls:
-                for tc in message.tool_calls:
-                    content.append({
-                        "toolUse": {
-                            "toolUseId": tc.id,
-                            "name": tc.function.name,
-                            "input": json.loads(tc.function.arguments) if isinstance(tc.function.arguments, str) else tc.function.arguments
-                        }
-                    })
-            return {"role": "assistant", "content": content}
-        elif isinstance(message, SystemMessage):
-            return {"role": "system", "content": [{"text": message.content}]}
-        elif isinstance(message, ToolMessage):
-            return {
-                "role": "user",
-                "content": [{
-                    "toolResult": {
-                        "toolUseId": message.tool_call_id,
-                        "content": [{"text": message.content}],
-                        "status": "success" if not hasattr(message, 'error') or not message.error else "error"
-                    }
-                }]
-            }
-        else:
-                return {"role": message.role, "content": [{"text": message.content or ""}]}
+        return _ROLE_DISPATCH.get(message.role, _conv_default)(message)
+
+    def _agent_cache_key(self, agui_tools: list) -> int:
+        """Compute a stable cache key for a list of AG-UI tool specs."""
+        return hash(tuple(sorted(
+            (
+                t.name,
+                json.dumps(t.parameters, sort_keys=True) if getattr(t, 'parameters', None) else ""
+            )
+            for t in agui_tools
+        )))
 
-    def _register_agui_tools_with_strands(self, agui_tools: List) -> None:
-        """Register AG-UI tools as proper Strands tools."""
+    def _register_agui_tools_with_strands(self, agui_tools: list) -> None:
+        """Register AG-UI tools as proper Strands tools, reusing cached agents."""
         if not agui_tools:
             return
 
-        strands_tools = []
-        for agui_tool in agui_tools:
-            strands_tool = self._create_strands_tool_from_agui(agui_tool)
-            strands_tools.append(strands_tool)
+        # Building a BedrockModel + Agent re-initializes boto clients and
+        # credential chains, so cache agents per tool signature instead of
+        # rebuilding them on every request.
+        key = self._agent_cache_key(agui_tools)
+        cached = self._agent_cache.get(key)
+        if cached is not None:
+            self._agent_cache.move_to_end(key)
+            self.strands_agent = cached
+            return
 
-        if strands_tools:
-            model = BedrockModel(
-                model_id=config.agent.model_id,
-                temperature=config.agent.temperature,
-                streaming=config.agent.streaming,
-            )
-            self.strands_agent = Agent(model=model, tools=strands_tools)
+        strands_tools = [self._create_strands_tool_from_agui(t) for t in agui_tools]
+        # Share the existing model instance (and its boto client/connection
+        # pool) across agents instead of constructing a fresh BedrockModel
+        # for every new tool set.
+        model = getattr(self.strands_agent, 'model', None)
+        if model is None:
+            model = _default_model()
+        agent = Agent(model=model, tools=strands_tools)
+        self._agent_cache[key] = agent
+        if len(self._agent_cache) > _AGENT_CACHE_SIZE:
+            self._agent_cache.popitem(last=False)
+        self.strands_agent = agent
 
     def _create_strands_tool_from_agui(self, agui_tool):
         """Create a proper Strands tool from AG-UI tool specification."""
 
-        properties = agui_tool.parameters.get('properties', {}) if hasattr(agui_tool, 'parameters') and agui_tool.parameters else {}
+        if hasattr(agui_tool, 'parameters') and agui_tool.parameters:
+            properties = agui_tool.parameters.get('properties', {})
+        else:
+            properties = {}
         param_names = list(properties.keys())
+        tool_name = agui_tool.name
 
-        def create_frontend_tool():
-            if param_names:
-                param_str = ', '.join(f'{param}: str = None' for param in param_names)
-                func_code = f"""
-async def frontend_tool({param_str}) -> str:
-    \"\"\"Tool that will be executed by the frontend - this should never be called directly.\"\"\"
-    raise RuntimeError(f"Frontend tool {agui_tool.name} was executed in backend - this indicates improper AG-UI integration")
-"""
-            else:
-                func_code = f"""
-async def frontend_tool(**kwargs) -> str:
-    \"\"\"Tool that will be executed by the frontend - this should never be called directly.\"\"\"
-    raise RuntimeError(f"Frontend tool {agui_tool.name} was executed in backend - this indicates improper AG-UI integration")
-"""
-
-            local_vars = {'agui_tool': agui_tool}
-            exec(func_code, globals(), local_vars)
-            return local_vars['frontend_tool']
-
-        frontend_tool = create_frontend_tool()
+        async def frontend_tool(**kwargs) -> str:
+            """Tool that will be executed by the frontend - this should never be called directly."""
+            raise RuntimeError(
+                f"Frontend tool {tool_name} was executed in backend"
+                " - this indicates improper AG-UI integration"
+            )
 
-        frontend_tool.__name__ = agui_tool.name
+        frontend_tool.__name__ = tool_name
         frontend_tool.__doc__ = agui_tool.description
+        # Attach an explicit signature so Strands sees the declared parameters
+        # without us having to compile per-tool source via exec().
+        frontend_tool.__signature__ = inspect.Signature(
+            parameters=[
+                inspect.Parameter(
+                    name, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=str
+                )
+                for name in param_names
+            ],
+            return_annotation=str,
+        )
 
         return tool(frontend_tool)
 
-    def _convert_strands_to_agui_events(
+    async def _drive(
         self,
-        strands_event: Union[TypedEvent, Dict[str, Any]],
+        stream: AsyncGenerator,
         execution_state: ExecutionState
-    ) -> List[Event]:
-        """Convert Strands events to AG-UI events."""
-        events = []
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Drive a Strands event stream through the AG-UI event converter.
+
+        Consecutive text deltas for the same message are concatenated so
+        bursts of single-token chunks reach the consumer as one event. A
+        buffered delta is flushed once it has aged _DELTA_FLUSH_DELAY since
+        it was first buffered or grown past _DELTA_FLUSH_SIZE, whichever
+        comes first, so steady sub-delay streams still flush promptly. Any
+        non-text event flushes the buffered delta first, preserving order.
+        """
+        pending = None  # buffered TextMessageContentEvent awaiting flush
+        deadline = 0.0  # loop time at which the buffered delta must flush
+        loop = asyncio.get_running_loop()
+        ait = stream.__aiter__()
+        next_task = None
+        try:
+            while True:
+                try:
+                    if next_task is not None:
+                        strands_event = await next_task
+                        next_task = None
+                    elif pending is not None:
+                        # The deadline is anchored to when the delta was
+                        # first buffered, not the last arrival, so it cannot
+                        # be pushed back indefinitely by a fast stream.
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            yield pending
+                            pending = None
+                            continue
+                        next_task = asyncio.ensure_future(ait.__anext__())
+                        done, _ = await asyncio.wait({next_task}, timeout=timeout)
+                        if not done:
+                            yield pending
+                            pending = None
+                            continue
+                        task, next_task = next_task, None
+                        strands_event = task.result()
+                    else:
+                        strands_event = await ait.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    # The stream died mid-run: deliver the already-received
+                    # text before surfacing the error, as the uncoalesced
+                    # path would have.
+                    if pending is not None:
+                        yield pending
+                        pending = None
+                    raise
+
+                for agui_event in self._convert_strands_to_agui_events(
+                    strands_event, execution_state
+                ):
+                    if type(agui_event) is TextMessageContentEvent:
+                        if pending is not None and pending.message_id == agui_event.message_id:
+                            merged = pending.delta + agui_event.delta
+                            if len(merged) >= _DELTA_FLUSH_SIZE:
+                                yield TextMessageContentEvent.model_construct(
+                                    type=EventType.TEXT_MESSAGE_CONTENT,
+                                    message_id=pending.message_id,
+                                    delta=merged
+                                )
+                                pending = None
+                            else:
+                                pending = TextMessageContentEvent.model_construct(
+                                    type=EventType.TEXT_MESSAGE_CONTENT,
+                                    message_id=pending.message_id,
+                                    delta=merged
+                                )
+                        else:
+                            if pending is not None:
+                                yield pending
+                            pending = agui_event
+                            deadline = loop.time() + _DELTA_FLUSH_DELAY
+                    else:
+                        if pending is not None:
+                            yield pending
+                            pending = None
+                        yield agui_event
+        finally:
+            # Reap the speculative __anext__ task on any exit (including
+            # GeneratorExit on client disconnect) so it cannot keep driving
+            # the stream or log "exception was never retrieved".
+            if next_task is not None:
+                next_task.cancel()
+                try:
+                    await next_task
+                except (asyncio.CancelledError, Exception):
+                    pass
 
-        if isinstance(strands_event, dict):
-            if 'event' in strands_event:
-                event_data = strands_event['event']
-
-                if 'messageStart' in event_data:
-                    if not execution_state.current_message_id:
-                        execution_state.current_message_id = str(uuid.uuid4())
-                        events.append(TextMessageStartEvent(
-                            message_id=execution_state.current_message_id,
-                            role="assistant"
-                        ))
-
-                elif 'contentBlockDelta' in event_data:
-                    delta_data = event_data['contentBlockDelta']
-                    if 'delta' in delta_data and 'text' in delta_data['delta']:
-                        if not execution_state.current_message_id:
-                            execution_state.current_message_id = str(uuid.uuid4())
-                            events.append(TextMessageStartEvent(
-                                message_id=execution_state.current_message_id,
-                                role="assistant"
-                            ))
-
-                        events.append(TextMessageContentEvent(
-                            message_id=execution_state.current_message_id,
-                            delta=delta_data['delta']['text']
-                        ))
-
-                # Handle tool use start
-                elif 'contentBlockStart' in event_data:
-                    start_data = event_data['contentBlockStart']
-                    if 'start' in start_data and 'toolUse' in start_data['start']:
-                        tool_use = start_data['start']['toolUse']
-                        tool_call_id = tool_use.get('toolUseId', str(uuid.uuid4()))
-                        tool_name = tool_use.get('name', 'unknown')
-
-                        execution_state.pending_tools[tool_call_id] = {
-                            'name': tool_name,
-                            'input': tool_use.get('input', {})
-                        }
+        if pending is not None:
+            yield pending
 
-                        events.append(ToolCallStartEvent(
-                            tool_call_id=tool_call_id,
-                            tool_call_name=tool_name
-                        ))
-
-            # Handle current_tool_use events (tool input streaming)
-            elif 'current_tool_use' in strands_event:
-                tool_use = strands_event['current_tool_use']
-                tool_call_id = tool_use.get('toolUseId', str(uuid.uuid4()))
-
-                # Check if this is a new tool or continuation
-                if tool_call_id not in execution_state.pending_tools:
-                    execution_state.pending_tools[tool_call_id] = {
-                        'name': tool_use.get('name', 'unknown'),
-                        'input': tool_use.get('input', {})
-                    }
-
-                    events.append(ToolCallStartEvent(
-                        tool_call_id=tool_call_id,
-                        tool_call_name=tool_use.get('name', 'unknown')
-                    ))
-
-                    # Emit args event only once when tool starts, with complete input
-                    tool_input = tool_use.get('input', {})
-                    events.append(ToolCallArgsEvent(
-                        tool_call_id=tool_call_id,
-                        delta=json.dumps(tool_input) if tool_input else '{}'
-                    ))
-                else:
-                    # Update the input for existing tool, but don't emit args again
-                    execution_state.pending_tools[tool_call_id]['input'] = tool_use.get('input', {})
-
-            # Handle complete message with toolUse
-            elif 'message' in strands_event:
-                message = strands_event['message']
-                if message.get('role') == 'assistant' and 'content' in message:
-                    for content_item in message['content']:
-                        if 'toolUse' in content_item:
-                            tool_use = content_item['toolUse']
-                            tool_call_id = tool_use.get('toolUseId', str(uuid.uuid4()))
-                            tool_name = tool_use.get('name', 'unknown')
-
-                            # Ensure we have the tool tracked
-                            if tool_call_id not in execution_state.pending_tools:
-                                execution_state.pending_tools[tool_call_id] = {
-                                    'name': tool_name,
-                                    'input': tool_use.get('input', {})
-                                }
-
-                            # Emit tool args event with complete input
-                            tool_input = tool_use.get('input', {})
-                            events.append(ToolCallArgsEvent(
-                                tool_call_id=tool_call_id,
-                                delta=json.dumps(tool_input) if tool_input else '{}'
-                            ))
-
-                            # Emit tool call end
-                            events.append(ToolCallEndEvent(tool_call_id=tool_call_id))
-
-        # Legacy handling for TypedEvent objects (if any)
-        elif hasattr(strands_event, '__dict__'):
-            # Handle model streaming events
-            if isinstance(strands_event, ModelStreamChunkEvent):
-                if hasattr(strands_event, 'chunk') and strands_event.chunk:
-                    chunk_data = strands_event.chunk
-                    if isinstance(chunk_data, dict) and 'contentBlockDelta' in chunk_data:
-                        delta = chunk_data['contentBlockDelta'].get('delta', {})
-                        if 'text' in delta:
-                            if not execution_state.current_message_id:
-                                execution_state.current_message_id = str(uuid.uuid4())
-                                events.append(TextMessageStartEvent(
-                                    message_id=execution_state.current_message_id,
-                                    role="assistant"
-                                ))
-
-                            events.append(TextMessageContentEvent(
-                                message_id=execution_state.current_message_id,
-                                delta=delta['text']
-                            ))
-
-        return events
+
+    def _convert_strands_to_agui_events(
+        self,
+        strands_event: TypedEvent | dict[str, Any],
+        execution_state: ExecutionState,
+        _dispatch=_STRANDS_DISPATCH,
+    ) -> Iterator[Event]:
+        """Convert Strands events to AG-UI events, yielding them as produced."""
+
+        if isinstance(strands_event, dict):
+            for key, handler in _dispatch.items():
+                if key in strands_event:
+                    yield from handler(strands_event, execution_state)
+                    return
 
     async def run_streaming(self, input_data: RunAgentInput) -> AsyncGenerator[Event, None]:
         """
@@ -324,126 +610,111 @@ async def frontend_tool(**kwargs) -> str:
         execution_state = ExecutionState(
             thread_id=input_data.thread_id,
             run_id=input_data.run_id,
-            pending_tools={},
-            tool_results={}
         )
-        self.execution_states[f"{input_data.thread_id}:{input_data.run_id}"] = execution_state
+        state_key = (input_data.thread_id, input_data.run_id)
+        self.execution_states[state_key] = execution_state
+        if len(self.execution_states) > _EXECUTION_STATE_LIMIT:
+            self.execution_states.popitem(last=False)
 
         yield RunStartedEvent(
             thread_id=input_data.thread_id,
             run_id=input_data.run_id
         )
 
+        # Assign the assistant message id up front; the start event itself
+        # is emitted by the delta handler when text first arrives, so
+        # tool-only runs produce no empty text message and tool events are
+        # never framed inside one.
+        execution_state.current_message_id = _new_id()
+
         try:
             if input_data.tools:
                 self._register_agui_tools_with_strands(input_data.tools)
 
-            has_tool_results = any(isinstance(msg, ToolMessage) for msg in input_data.messages)
-
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.debug(f"Processing {len(input_data.messages)} messages, has_tool_results: {has_tool_results}")
+            # Single pass over the history: convert messages, collect tool
+            # results, and track the latest user message as we go instead of
+            # re-scanning input_data.messages for each question.
+            strands_messages = []
+            tool_results_info = []
+            user_message = None
+            has_existing_tooluse = False
+
+            for msg in input_data.messages:
+                # type() identity checks: the discriminated union gives us
+                # concrete message classes, so no subclass handling is needed.
+                kind = type(msg)
+                if kind is ToolMessage:
+                    tool_results_info.append((msg, msg.tool_call_id, msg.content))
+                    continue
+                if kind is SystemMessage:
+                    continue
+                if kind is UserMessage:
+                    user_message = msg.content
+                elif kind is AssistantMessage and msg.tool_calls:
+                    has_existing_tooluse = True
+                strands_messages.append(self._convert_agui_message_to_strands(msg))
+
+            has_tool_results = bool(tool_results_info)
+            logger.debug(
+                f"Processing {len(input_data.messages)} messages, "
+                f"has_tool_results: {has_tool_results}"
+            )
 
             if has_tool_results:
-                tool_results_info = []
-                for msg in input_data.messages:
-                    if isinstance(msg, ToolMessage):
-                        tool_results_info.append({
-                            'message': msg,
-                            'tool_call_id': msg.tool_call_id,
-                            'content': msg.content
-                        })
-
-                strands_messages = []
-                for msg in input_data.messages:
-                    if not isinstance(msg, ToolMessage) and not isinstance(msg, SystemMessage):
-                        strands_msg = self._convert_agui_message_to_strands(msg)
-                        strands_messages.append(strands_msg)
-
-                has_existing_tooluse = False
-                for msg in strands_messages:
-                    if msg.get("role") == "assistant" and isinstance(msg.get("content"), list):
-                        for content_item in msg["content"]:
-                            if "toolUse" in content_item:
-                                has_existing_tooluse = True
-                                break
-                        if has_existing_tooluse:
-                            break
-
-                if tool_results_info and (not has_existing_tooluse or len(strands_messages) == 0):
-                    tool_use_content = []
-
-                    for tool_info in tool_results_info:
-                        tool_name = "execute_ppl_query"
-                        if input_data.tools:
-                            tool_name = input_data.tools[0].name
+                tool_name = input_data.tools[0].name if input_data.tools else "execute_ppl_query"
+                need_synthetic_tooluse = not has_existing_tooluse or len(strands_messages) == 0
+                tool_use_content = []
+                tool_result_content = []
 
+                for _msg, tool_call_id, content in tool_results_info:
+                    if need_synthetic_tooluse:
                         tool_use_content.append({
                             "toolUse": {
-                                "toolUseId": tool_info['tool_call_id'],
+                                "toolUseId": tool_call_id,
                                 "name": tool_name,
                                 "input": {"query": "inferred_from_context"}
                             }
                         })
+                    tool_result_content.append({
+                        "toolResult": {
+                            "toolUseId": tool_call_id,
+                            "content": [{"text": str(content)}]
+                        }
+                    })
 
+                if need_synthetic_tooluse:
                     strands_messages.append({
                         "role": "assistant",
                         "content": tool_use_content
                     })
 
-                if tool_results_info:
-                    tool_result_content = []
-                    for tool_info in tool_results_info:
-                        tool_result_content.append({
-                            "toolResult": {
-                                "toolUseId": tool_info['tool_call_id'],
-                                "content": [{"text": str(tool_info['content'])}]
-                            }
-                        })
-
-                    strands_messages.append({
-                        "role": "user",
-                        "content": tool_result_content
-                    })
+                strands_messages.append({
+                    "role": "user",
+                    "content": tool_result_content
+                })
 
                 self.strands_agent.messages = strands_messages
-                logger.debug(f"Reconstructed conversation with {len(strands_messages)} messages for Bedrock")
-                async for strands_event in self.strands_agent.stream_async():
-                    agui_events = self._convert_strands_to_agui_events(strands_event, execution_state)
-                    for agui_event in agui_events:
-                        yield agui_event
+                logger.debug(
+                    f"Reconstructed conversation with {len(strands_messages)} messages for Bedrock"
+                )
+                stream = self.strands_agent.stream_async()
 
             else:
-                strands_messages = []
-                for msg in input_data.messages:
-                    if not isinstance(msg, SystemMessage):
-                        strands_msg = self._convert_agui_message_to_strands(msg)
-                        strands_messages.append(strands_msg)
-
                 self.strands_agent.messages = strands_messages
-                user_message = None
-                for msg in reversed(input_data.messages):
-                    if isinstance(msg, UserMessage):
-                        user_message = msg.content
-                        break
 
                 if user_message:
-                    async for strands_event in self.strands_agent.stream_async(user_message):
-                        agui_events = self._convert_strands_to_agui_events(strands_event, execution_state)
-
-                        for agui_event in agui_events:
-                            yield agui_event
+                    stream = self.strands_agent.stream_async(user_message)
                 else:
-                    # No user message found - let Strands handle the conversation without additional prompting
-                    async for strands_event in self.strands_agent.stream_async():
-                        agui_events = self._convert_strands_to_agui_events(strands_event, execution_state)
+                    # No user message found - let Strands handle the
+                    # conversation without additional prompting
+                    stream = self.strands_agent.stream_async()
 
-                        for agui_event in agui_events:
-                            yield agui_event
+            async for agui_event in self._drive(stream, execution_state):
+                yield agui_event
 
-            # Close any open text message
-            if execution_state.current_message_id:
-                yield TextMessageEndEvent(message_id=execution_state.current_message_id)
+            # Close the text message if one was opened during the run
+            if execution_state.message_started:
+                yield _mk_text_end(execution_state.current_message_id)
 
             # Always complete successfully - frontend tools are handled by frontend
             yield RunFinishedEvent(
@@ -456,4 +727,16 @@ async def frontend_tool(**kwargs) -> str:
             yield RunErrorEvent(
                 message=str(e),
                 code="AGENT_ERROR"
-            )
\ No newline at end of file
+            )
+        finally:
+            self.execution_states.pop(state_key, None)
+
+    async def run_streaming_bytes(self, input_data: RunAgentInput) -> AsyncGenerator[bytes, None]:
+        """Run the agent and yield pre-encoded SSE frames instead of Event models.
+
+        Encoding is amortized into the producer: each event is framed once
+        here and never re-serialized downstream. Callers that need typed
+        events should keep using run_streaming.
+        """
+        async for agui_event in self.run_streaming(input_data):
+            yield encode_sse(agui_event)
@@ -2,16 +2,14 @@
 Command-line interface for Strands AG-UI Agent.
 """
 
-import asyncio
 import sys
-from typing import Optional
 
 import click
 
-from .config import config
-
 
 @click.group()
+# Keep the version as a literal: importlib.metadata.version() would scan
+# sys.path for dist-info on every CLI invocation, not just --version.
 @click.version_option(version="0.2.0")
 def cli():
     """Strands AG-UI Agent CLI."""
@@ -24,12 +22,17 @@ def cli():
 @click.option("--log-level", default=None, help="Log level")
 @click.option("--reload", is_flag=True, help="Enable auto-reload")
 def serve(
-    host: Optional[str],
-    port: Optional[int],
-    log_level: Optional[str],
+    host: str | None,
+    port: int | None,
+    log_level: str | None,
     reload: bool
 ):
     """Start the AG-UI agent server."""
+    # Heavy imports (pydantic, FastAPI, strands) stay inside serve() so
+    # `--help` and bad invocations only pay for click.
+    import asyncio
+
+    from .config import config
 
     # Override config with CLI options
     if host:
@@ -42,7 +45,9 @@ def serve(
         config.server.reload = reload
 
     click.echo("Starting AG-UI agent server...")
-    from .server import main
+    from .server import _install_uvloop, main
+
+    _install_uvloop()
 
     # Run the server
     try:
@@ -57,4 +62,4 @@ def serve(
 
 
 if __name__ == "__main__":
-    cli()
\ No newline at end of file
+    cli()
@@ -4,12 +4,13 @@ Configuration management for Strands AG-UI Agent.
 This module provides configuration options for the agent and server.
 """
 
+import functools
 import os
-from typing import Optional
-from pydantic import BaseModel
+from dataclasses import dataclass, field
 
 
-class ServerConfig(BaseModel):
+@dataclass(slots=True)
+class ServerConfig:
     """Server configuration settings."""
     host: str = "0.0.0.0"
     port: int = 8000
@@ -18,23 +19,31 @@ class ServerConfig(BaseModel):
     workers: int = 1
 
 
-class AgentConfig(BaseModel):
+@dataclass(slots=True)
+class AgentConfig:
     """Agent configuration settings."""
     name: str = "Strands AG-UI Agent"
     model_id: str = "us.anthropic.claude-3-5-sonnet-20241022-v2:0"
     temperature: float = 0.7
     streaming: bool = True
-    max_tokens: Optional[int] = None
+    max_tokens: int | None = None
 
 
-class Config(BaseModel):
+@dataclass(slots=True)
+class Config:
     """Main configuration class."""
-    server: ServerConfig = ServerConfig()
-    agent: AgentConfig = AgentConfig()
+    server: ServerConfig = field(default_factory=ServerConfig)
+    agent: AgentConfig = field(default_factory=AgentConfig)
 
     @classmethod
+    @functools.cache
     def from_env(cls) -> "Config":
-        """Create configuration from environment variables."""
+        """Create configuration from environment variables.
+
+        Memoized: repeated calls (e.g. config reloads in tests) return the
+        same instance instead of re-parsing the environment.
+        """
+        max_tokens = os.getenv("MAX_TOKENS")
         return cls(
             server=ServerConfig(
                 host=os.getenv("HOST", "0.0.0.0"),
@@ -48,10 +57,23 @@ class Config(BaseModel):
                 model_id=os.getenv("MODEL_ID", "us.anthropic.claude-3-5-sonnet-20241022-v2:0"),
                 temperature=float(os.getenv("TEMPERATURE", "0.7")),
                 streaming=os.getenv("STREAMING", "true").lower() == "true",
-                max_tokens=int(os.getenv("MAX_TOKENS")) if os.getenv("MAX_TOKENS") else None,
+                max_tokens=int(max_tokens) if max_tokens else None,
             )
         )
 
 
-# Global configuration instance
-config = Config.from_env()
\ No newline at end of file
+_config: Config | None = None
+
+
+def __getattr__(name: str) -> Config:
+    """Build the global configuration lazily on first attribute access.
+
+    Importing this module stays side-effect free; the environment is only
+    read when `config` is first used.
+    """
+    if name == "config":
+        global _config
+        if _config is None:
+            _config = Config.from_env()
+        return _config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,19 +7,146 @@ Provides a simplified AG-UI streaming endpoint for Strands Agents.
 import asyncio
 import logging
 
-from fastapi import FastAPI
+import orjson
+from ag_ui.core import RunAgentInput, TextMessageContentEvent
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-
-from ag_ui.core import RunAgentInput, RunErrorEvent
-from ag_ui.encoder import EventEncoder
+from starlette.middleware import Middleware
 
 from .agent import StrandsAGUIAgent
+from .sse import encode_sse as _encode_sse
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Warm RunAgentInput's tagged-union validator (discriminated on message
+# role) at import time so the first /stream request doesn't pay pydantic's
+# lazy schema build.
+RunAgentInput.model_rebuild()
+
+# SSE response constants for the process lifetime; avoids a method call and
+# headers-dict allocation per request. The media type is what
+# ag_ui.encoder.EventEncoder.get_content_type() returns; inlining it drops
+# that import chain from the server entirely (frames come from .sse).
+_SSE_MEDIA_TYPE = "text/event-stream"
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+# Pre-framed RUN_ERROR envelope: only the (orjson-escaped) message is
+# interpolated, so the error path skips pydantic and the encoder entirely.
+_ERR_TEMPLATE = b'data: {"type":"RUN_ERROR","message":%s,"code":"STREAMING_ERROR"}\n\n'
+
+# Root endpoint body is static; serving pre-encoded bytes skips FastAPI's
+# jsonable_encoder pass for health probes hammering /.
+# Middleware built once and handed to the FastAPI constructor: apps created
+# repeatedly (tests, embedding) share the spec, and Starlette compiles the
+# stack at init instead of invalidating it via add_middleware.
+_CORS_MIDDLEWARE = Middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+_ROOT_BYTES = orjson.dumps({
+    "name": "Strands AG-UI Agent Server",
+    "version": "0.1.0",
+    "description": "AG-UI streaming endpoint for Strands Agents",
+    "endpoint": "/stream",
+})
+
+
+async def _coalesce(events, max_bytes: int = 8192, max_delay: float = 0.005):
+    """
+    Coalesce consecutive text-delta frames into fewer SSE writes.
+
+    Encoded TextMessageContentEvent frames are buffered until either
+    max_bytes accumulate or max_delay elapses without a new event; any
+    other event type flushes the buffer immediately (after the buffered
+    text, so event ordering is unchanged).
+    """
+    buf = bytearray()
+    ait = events.__aiter__()
+    pending = None
+    # Level check hoisted out of the loop: with DEBUG off (the normal case)
+    # no log-call or format work happens per event.
+    debug = logger.isEnabledFor(logging.DEBUG)
+    try:
+        while True:
+            try:
+                if pending is not None:
+                    event = await pending
+                    pending = None
+                elif buf:
+                    pending = asyncio.ensure_future(ait.__anext__())
+                    done, _ = await asyncio.wait({pending}, timeout=max_delay)
+                    if not done:
+                        yield bytes(buf)
+                        buf.clear()
+                        continue
+                    task, pending = pending, None
+                    event = task.result()
+                else:
+                    event = await ait.__anext__()
+            except StopAsyncIteration:
+                break
+            except Exception:
+                # Deliver the already-encoded frames before surfacing the
+                # error so the client keeps everything the agent produced.
+                if buf:
+                    yield bytes(buf)
+                    buf.clear()
+                raise
+
+            if debug:
+                logger.debug("Streaming event: %s", event.type)
+            frame = _encode_sse(event)
+            if type(event) is TextMessageContentEvent:
+                buf += frame
+                if len(buf) >= max_bytes:
+                    yield bytes(buf)
+                    buf.clear()
+            else:
+                if buf:
+                    buf += frame
+                    yield bytes(buf)
+                    buf.clear()
+                else:
+                    yield frame
+    finally:
+        # Reap the speculative __anext__ task on any exit (including
+        # GeneratorExit on client disconnect) so it cannot keep driving
+        # the agent stream or log "exception was never retrieved".
+        if pending is not None:
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    if buf:
+        yield bytes(buf)
+
+
+def _sse_response(gen) -> StreamingResponse:
+    """Wrap an SSE byte generator in a StreamingResponse with the shared
+    media type and headers, keeping one place to tune the response path."""
+    return StreamingResponse(gen, media_type=_SSE_MEDIA_TYPE, headers=_SSE_HEADERS)
+
+
+def _install_uvloop() -> bool:
+    """Install uvloop as the asyncio event loop policy when available."""
+    try:
+        import uvloop
+    except ImportError:  # uvloop is not available on Windows
+        return False
+    uvloop.install()
+    return True
+
 
 def create_app(agent: StrandsAGUIAgent = None) -> FastAPI:
     """
@@ -38,27 +165,13 @@ def create_app(agent: StrandsAGUIAgent = None) -> FastAPI:
         title="Strands AG-UI Agent Server",
         description="AG-UI streaming endpoint for Strands Agents",
         version="0.1.0",
+        middleware=[_CORS_MIDDLEWARE],
     )
 
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
-    encoder = EventEncoder()
-
     @app.get("/")
     async def root():
         """Root endpoint providing basic information."""
-        return {
-            "name": "Strands AG-UI Agent Server",
-            "version": "0.1.0",
-            "description": "AG-UI streaming endpoint for Strands Agents",
-            "endpoint": "/stream"
-        }
+        return Response(content=_ROOT_BYTES, media_type="application/json")
 
     @app.post("/stream")
     async def stream_endpoint(input_data: RunAgentInput):
@@ -76,27 +189,13 @@ def create_app(agent: StrandsAGUIAgent = None) -> FastAPI:
         async def event_generator():
             """Generate AG-UI events from the agent."""
             try:
-                async for event in agent.run_streaming(input_data):
-                    encoded_event = encoder.encode(event)
-                    logger.debug(f"Streaming event: {event.type}")
-                    yield encoded_event
+                async for chunk in _coalesce(agent.run_streaming(input_data)):
+                    yield chunk
             except Exception as e:
                 logger.error(f"Error in streaming: {e}")
-                error_event = RunErrorEvent(
-                    message=str(e),
-                    code="STREAMING_ERROR"
-                )
-                yield encoder.encode(error_event)
-
-        return StreamingResponse(
-            event_generator(),
-            media_type=encoder.get_content_type(),
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
-            }
-        )
+                yield _ERR_TEMPLATE % orjson.dumps(str(e))
+
+        return _sse_response(event_generator())
 
     return app
 
@@ -104,10 +203,23 @@ def create_app(agent: StrandsAGUIAgent = None) -> FastAPI:
 async def main():
     """Main entry point for running the server."""
     import uvicorn
+
     from .config import config
 
-    agent = StrandsAGUIAgent(agent_name=config.agent.name)
-    app = create_app(agent)
+    # Configure logging here rather than at import so embedding create_app
+    # in a larger application doesn't clobber the host's logging setup.
+    logging.basicConfig(level=logging.INFO)
+
+    # With reload (or multiple workers) uvicorn runs the app in child
+    # processes, which need an importable target rather than a live object;
+    # the factory string lets each child build its own app. Otherwise build
+    # the app in-process as before.
+    reload = config.server.reload
+    if reload:
+        app = "strands_agui_agent.server:create_app"
+    else:
+        agent = StrandsAGUIAgent(agent_name=config.agent.name)
+        app = create_app(agent)
 
     logger.info(f"Starting Strands AG-UI Agent server on {config.server.host}:{config.server.port}")
     logger.info(f"Agent: {config.agent.name}")
@@ -121,12 +233,15 @@ async def main():
         port=config.server.port,
         log_level=config.server.log_level,
         access_log=True,
-        reload=config.server.reload,
-        workers=config.server.workers if not config.server.reload else 1,
+        reload=reload,
+        workers=config.server.workers if not reload else 1,
+        factory=reload,
+        loop="uvloop" if _install_uvloop() else "auto",
     )
     server = uvicorn.Server(uvicorn_config)
     await server.serve()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    _install_uvloop()
+    asyncio.run(main())
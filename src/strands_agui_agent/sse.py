@@ -0,0 +1,32 @@
+"""
+Server-Sent Events encoding for AG-UI events.
+
+Shared by the FastAPI server and the agent's pre-encoded byte stream so
+both produce identical wire frames.
+"""
+
+import orjson
+from ag_ui.core import Event, TextMessageContentEvent
+
+# SSE framing constants, built once instead of per event.
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+
+def encode_sse(event: Event) -> bytes:
+    """
+    Encode an AG-UI event as a Server-Sent Events frame.
+
+    TextMessageContentEvent is by far the most frequent event on long
+    completions, so it bypasses pydantic serialization entirely and builds
+    the payload dict directly from its two fields.
+    """
+    if type(event) is TextMessageContentEvent:
+        payload = {
+            "type": "TEXT_MESSAGE_CONTENT",
+            "messageId": event.message_id,
+            "delta": event.delta,
+        }
+    else:
+        payload = event.model_dump(by_alias=True, exclude_none=True, mode="json")
+    return _SSE_PREFIX + orjson.dumps(payload) + _SSE_SUFFIX